@@ -13,9 +13,13 @@ import subprocess
 import json
 import shutil
 import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Dict, Any
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
 
 
@@ -41,7 +45,59 @@ def get_github_token_from_cli() -> str | None:
     return None
 
 
+def parse_repo(repo: str) -> tuple[str, str]:
+    """
+    Split a repository string into its owner and name.
+    
+    Args:
+        repo: Repository in format 'owner/repo'
+        
+    Returns:
+        Tuple of (owner, name)
+        
+    Raises:
+        ValueError: If repo is not in 'owner/repo' format
+    """
+    owner, sep, name = repo.partition('/')
+    if not sep or not owner or not name or '/' in name:
+        raise ValueError(f"Expected format 'owner/repo', got '{repo}'")
+    return owner, name
+
+
 class RepoContentCopier:
+    # Issue creation is I/O bound; keep concurrency low to stay clear of
+    # GitHub's secondary (abuse) rate limits
+    MAX_ISSUE_WORKERS = 4
+    
+    # Pause once fewer than this many requests remain in the rate limit window
+    RATE_LIMIT_THRESHOLD = 10
+    
+    # Attempts per issue when GitHub answers with a secondary rate limit
+    MAX_CREATE_ATTEMPTS = 3
+    
+    # Attempts per page of the issue query on transient server errors
+    MAX_QUERY_ATTEMPTS = 4
+    
+    ISSUES_QUERY = """
+    query($owner: String!, $name: String!, $states: [IssueState!], $cursor: String) {
+      repository(owner: $owner, name: $name) {
+        issues(first: 100, after: $cursor, states: $states) {
+          pageInfo { endCursor hasNextPage }
+          nodes {
+            number
+            title
+            body
+            state
+            createdAt
+            url
+            author { login }
+            labels(first: 50) { nodes { name } }
+          }
+        }
+      }
+    }
+    """
+    
     def __init__(self, source_repo: str, dest_repo: str, github_token: str):
         """
         Initialize the repository content copier.
@@ -55,13 +111,29 @@ class RepoContentCopier:
         self.dest_repo = dest_repo
         self.github_token = github_token
         
-        self.source_owner, self.source_name = source_repo.split('/')
-        self.dest_owner, self.dest_name = dest_repo.split('/')
+        self.source_owner, self.source_name = parse_repo(source_repo)
+        self.dest_owner, self.dest_name = parse_repo(dest_repo)
         
         self.headers = {
             'Authorization': f'token {self.github_token}',
             'Accept': 'application/vnd.github.v3+json'
         }
+        
+        # Share one session so API calls reuse pooled keep-alive connections
+        # instead of paying a TCP + TLS handshake per request. POST is left out of
+        # the retried methods: a gateway error can arrive after GitHub has already
+        # created the issue, and retrying it would create a duplicate
+        retry = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=['GET', 'PATCH'],
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.headers.update(self.headers)
     
     def validate_token(self) -> bool:
         """
@@ -72,7 +144,7 @@ class RepoContentCopier:
         """
         print("Validating GitHub token...")
         url = "https://api.github.com/user"
-        response = requests.get(url, headers=self.headers)
+        response = self.session.get(url)
         
         if response.status_code == 200:
             user_data = response.json()
@@ -102,8 +174,23 @@ class RepoContentCopier:
         """
         print(f"\nChecking if destination repository is empty: {self.dest_repo}")
         
+        # The contents endpoint returns 404 both for a repo with no commits and
+        # for one that doesn't exist or isn't visible to the token, so look up
+        # the repository itself first to tell those apart
+        url = f"https://api.github.com/repos/{self.dest_repo}"
+        response = self.session.get(url)
+        
+        if response.status_code == 404:
+            print("✗ Destination repository not found, or the token has no access to it")
+            return False, []
+        
+        if response.status_code != 200:
+            print(f"✗ Failed to check destination repository: {response.status_code}")
+            print(f"  Response: {response.text}")
+            return False, []
+        
         url = f"https://api.github.com/repos/{self.dest_repo}/contents"
-        response = requests.get(url, headers=self.headers)
+        response = self.session.get(url)
         
         if response.status_code == 404:
             # Empty repo with no commits returns 404
@@ -118,9 +205,9 @@ class RepoContentCopier:
         contents = response.json()
         
         # Define allowed files/folders (case-insensitive for some)
-        allowed_exact = {'.github', '.gitignore', 'codeowners', 'contributing.md', 
-                        'code_of_conduct.md', 'security.md'}
-        allowed_prefixes = ['readme', 'license']
+        allowed_exact = frozenset({'.github', '.gitignore', 'codeowners', 'contributing.md',
+                                   'code_of_conduct.md', 'security.md'})
+        allowed_prefixes = ('readme', 'license')
         
         unexpected_files = []
         
@@ -133,7 +220,7 @@ class RepoContentCopier:
                 continue
             
             # Check if it starts with an allowed prefix
-            if any(name_lower.startswith(prefix) for prefix in allowed_prefixes):
+            if name_lower.startswith(allowed_prefixes):
                 continue
             
             # This file is not allowed
@@ -148,28 +235,43 @@ class RepoContentCopier:
             print("✓ Destination repository is empty (only contains allowed files)")
             return True, []
         
-    def run_command(self, cmd: List[str], cwd: str = None) -> subprocess.CompletedProcess:
-        """Run a shell command and return the result."""
-        print(f"Running: {' '.join(cmd)}")
+    def run_command(self, cmd: List[str], cwd: str = None, quiet: bool = False) -> subprocess.CompletedProcess:
+        """Run a shell command and return the result.
+        
+        If quiet is True, stdout is discarded instead of captured and only
+        stderr is kept for error reporting. The GitHub token is masked in
+        everything echoed, since authenticated remote URLs embed it.
+        """
+        command_text = self.redact(' '.join(cmd))
+        print(f"Running: {command_text}")
         result = subprocess.run(
             cmd,
             cwd=cwd,
-            capture_output=True,
+            stdout=subprocess.DEVNULL if quiet else subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True
         )
         
         if result.returncode != 0:
-            print(f"Error: {result.stderr}")
-            raise Exception(f"Command failed: {' '.join(cmd)}")
+            print(f"Error: {self.redact(result.stderr)}")
+            raise Exception(f"Command failed: {command_text}")
         
         return result
     
+    def redact(self, text: str) -> str:
+        """Mask the GitHub token in text that is about to be printed."""
+        if not self.github_token:
+            return text
+        return text.replace(self.github_token, '***')
+    
     def copy_source_code(self):
         """
         Copy source code from the source repository to the destination repository.
         
-        Clones both repos to temp directories, copies files from source to dest,
-        then commits and pushes to the destination.
+        If the destination has no commits yet, the source snapshot is committed
+        as a new root commit inside the source clone and pushed straight to the
+        destination. Otherwise clones the destination as well, copies files from
+        source to dest, then commits and pushes to the destination.
         """
         print("\n" + "="*60)
         print("COPYING SOURCE CODE")
@@ -191,38 +293,101 @@ class RepoContentCopier:
             # Clone the source repository
             print(f"\nCloning source repository: {self.source_repo}")
             source_url = f"https://github.com/{self.source_repo}.git"
-            self.run_command(['git', 'clone', source_url, str(source_dir)])
+            # Only the latest snapshot is copied, so skip history and tags
+            self.run_command(['git', 'clone', '--quiet', '--depth=1', '--single-branch', '--no-tags',
+                              source_url, str(source_dir)], quiet=True)
             
-            # Clone the destination repository with authentication
-            print(f"\nCloning destination repository: {self.dest_repo}")
             dest_url = f"https://{self.github_token}@github.com/{self.dest_repo}.git"
-            self.run_command(['git', 'clone', dest_url, str(dest_dir)])
+            commit_msg = f"Copy content from {self.source_repo}"
+            
+            # Pass the commit identity per invocation instead of running git config
+            git_commit = ['git', '-c', 'user.email=copilot@github.com',
+                          '-c', 'user.name=GitHub Copilot', 'commit', '-m', commit_msg]
+            
+            # With no branches in the destination there is nothing to preserve, so
+            # skip the destination clone and file copy and push the source tree
+            # directly as a fresh root commit
+            result = self.run_command(['git', 'ls-remote', '--heads', dest_url])
+            if not result.stdout.strip():
+                print("\nDestination has no commits, pushing source snapshot directly...")
+                
+                # An orphan branch keeps the checked out files staged in the index
+                self.run_command(['git', 'checkout', '--orphan', 'import'], cwd=str(source_dir))
+                
+                # An empty source repo leaves nothing staged, and committing would fail
+                result = subprocess.run(
+                    ['git', 'diff', '--cached', '--quiet'],
+                    cwd=str(source_dir)
+                )
+                
+                if result.returncode == 0:
+                    print("\n✓ No changes to commit (source repository is empty)")
+                    return
+                
+                self.run_command(git_commit, cwd=str(source_dir))
+                self.run_command(['git', 'push', dest_url, 'import:main'], cwd=str(source_dir))
+                print("\n✓ Changes pushed to destination repository")
+                return
+            
+            # Clone the destination repository with authentication; only its tip
+            # is needed to commit on top of, so skip history and tags here too
+            print(f"\nCloning destination repository: {self.dest_repo}")
+            self.run_command(['git', 'clone', '--quiet', '--depth=1', '--single-branch', '--no-tags',
+                              dest_url, str(dest_dir)], quiet=True)
             
             # Copy files from source to destination (exclude .git directory)
             print("\nCopying files from source to destination...")
             
             files_copied = 0
             dirs_created = 0
+            source_root = str(source_dir)
             
-            for item in source_dir.rglob('*'):
-                # Skip .git directory
-                if '.git' in item.parts:
-                    continue
-                
-                # Calculate relative path
-                rel_path = item.relative_to(source_dir)
+            def walk(dirpath: str):
+                """Yield (path, rel_path, is_dir) for every entry under dirpath, skipping .git."""
+                with os.scandir(dirpath) as entries:
+                    for entry in entries:
+                        # Skip .git directory without descending into it
+                        if entry.name == '.git':
+                            continue
+                        
+                        # Relative path by slicing avoids Path.relative_to per entry
+                        rel_path = entry.path[len(source_root) + 1:]
+                        
+                        # DirEntry caches the file type, so no extra stat per entry
+                        if entry.is_dir(follow_symlinks=False):
+                            yield entry.path, rel_path, True
+                            yield from walk(entry.path)
+                        else:
+                            yield entry.path, rel_path, False
+            
+            for path, rel_path, is_dir in walk(source_root):
                 dest_item = dest_dir / rel_path
                 
-                if item.is_dir():
+                if is_dir:
                     # Create directory
-                    dest_item.mkdir(parents=True, exist_ok=True)
+                    os.makedirs(dest_item, exist_ok=True)
                     dirs_created += 1
                 else:
-                    # Copy file
-                    dest_item.parent.mkdir(parents=True, exist_ok=True)
-                    dest_item.write_bytes(item.read_bytes())
+                    # Copy file (walk yields each directory before its contents, so
+                    # the parent already exists). Both clones share a filesystem, so
+                    # hardlink where possible; git add only reads the file
+                    
+                    # Replace whatever the destination already has at this path;
+                    # neither linking nor recreating a symlink will overwrite it
+                    if os.path.lexists(dest_item):
+                        os.unlink(dest_item)
+                    
+                    try:
+                        os.link(path, dest_item, follow_symlinks=False)
+                    except (OSError, NotImplementedError):
+                        # Cross-device or unsupported; copy the mode too so the
+                        # exec bit matches what a hardlink would have kept
+                        shutil.copy(path, dest_item, follow_symlinks=False)
                     files_copied += 1
-                    print(f"  Copied: {rel_path}")
+                    
+                    # Periodic progress instead of a line per file
+                    if files_copied % 100 == 0:
+                        print(f"  ... {files_copied} files")
             
             print(f"\n✓ Created {dirs_created} directories")
             print(f"✓ Copied {files_copied} files")
@@ -230,25 +395,18 @@ class RepoContentCopier:
             # Stage, commit, and push changes to destination
             print("\nCommitting and pushing changes to destination repository...")
             
-            # Configure git user for the commit
-            self.run_command(['git', 'config', 'user.email', 'copilot@github.com'], cwd=str(dest_dir))
-            self.run_command(['git', 'config', 'user.name', 'GitHub Copilot'], cwd=str(dest_dir))
-            
             # Stage all changes
             self.run_command(['git', 'add', '.'], cwd=str(dest_dir))
             
-            # Check if there are changes to commit
+            # Check if there are staged changes to commit (exit code 1 means there are)
             result = subprocess.run(
-                ['git', 'status', '--porcelain'],
-                cwd=str(dest_dir),
-                capture_output=True,
-                text=True
+                ['git', 'diff', '--cached', '--quiet'],
+                cwd=str(dest_dir)
             )
             
-            if result.stdout.strip():
+            if result.returncode != 0:
                 # Commit the changes
-                commit_msg = f"Copy content from {self.source_repo}"
-                self.run_command(['git', 'commit', '-m', commit_msg], cwd=str(dest_dir))
+                self.run_command(git_commit, cwd=str(dest_dir))
                 
                 # Push to remote
                 self.run_command(['git', 'push', 'origin', 'HEAD'], cwd=str(dest_dir))
@@ -265,46 +423,79 @@ class RepoContentCopier:
     def get_issues(self, include_closed: bool = False) -> List[Dict[str, Any]]:
         """Fetch issues from the source repository.
         
+        Uses a single GraphQL query per page of 100 issues, which returns the
+        labels and author inline and (unlike the REST issues endpoint) never
+        includes pull requests. Results are returned in the same shape as the
+        REST API so they can be passed straight to create_issue.
+        
         Args:
             include_closed: If True, include closed issues. Default is False (open issues only).
         """
-        state = 'all' if include_closed else 'open'
+        states = ['OPEN', 'CLOSED'] if include_closed else ['OPEN']
         print(f"\nFetching {'all' if include_closed else 'open'} issues from {self.source_repo}...")
         
+        url = "https://api.github.com/graphql"
         issues = []
+        cursor = None
         page = 1
-        per_page = 100
         
         while True:
-            url = f"https://api.github.com/repos/{self.source_repo}/issues"
-            params = {
-                'state': state,
-                'page': page,
-                'per_page': per_page,
-                'filter': 'all'
+            variables = {
+                'owner': self.source_owner,
+                'name': self.source_name,
+                'states': states,
+                'cursor': cursor
             }
             
-            response = requests.get(url, headers=self.headers, params=params)
+            # The session doesn't retry POSTs (issue creation isn't idempotent),
+            # but this query is a read and safe to resend on transient errors
+            for attempt in range(1, self.MAX_QUERY_ATTEMPTS + 1):
+                response = self.session.post(url, json={'query': self.ISSUES_QUERY, 'variables': variables})
+                
+                if (response.status_code not in (429, 502, 503, 504)
+                        or attempt == self.MAX_QUERY_ATTEMPTS):
+                    break
+                
+                retry_after = response.headers.get('Retry-After')
+                delay = max(int(retry_after), 1) if retry_after else 2 ** attempt
+                print(f"  ⚠ Issue query failed ({response.status_code}), retrying in {delay} seconds...")
+                time.sleep(delay)
             
             if response.status_code != 200:
                 print(f"Error fetching issues: {response.status_code}")
                 print(f"Response: {response.text}")
+                print(f"⚠ Stopped after {len(issues)} issues; the issue list is incomplete")
                 break
             
-            page_issues = response.json()
-            
-            if not page_issues:
+            result = response.json()
+            if result.get('errors'):
+                print("Error fetching issues:")
+                for error in result['errors']:
+                    print(f"  {error.get('message', error)}")
+                print(f"⚠ Stopped after {len(issues)} issues; the issue list is incomplete")
                 break
             
-            # Filter out pull requests (they appear in issues API)
-            page_issues = [issue for issue in page_issues if 'pull_request' not in issue]
-            issues.extend(page_issues)
+            connection = result['data']['repository']['issues']
             
-            print(f"  Fetched page {page}: {len(page_issues)} items")
+            for node in connection['nodes']:
+                issues.append({
+                    'number': node['number'],
+                    'title': node['title'],
+                    'body': node['body'],
+                    'state': node['state'].lower(),
+                    'created_at': node['createdAt'],
+                    'html_url': node['url'],
+                    # Author is null for deleted accounts
+                    'user': {'login': (node['author'] or {}).get('login', 'ghost')},
+                    'labels': [{'name': label['name']} for label in node['labels']['nodes']]
+                })
             
-            if len(page_issues) < per_page:
+            print(f"  Fetched page {page}: {len(connection['nodes'])} items")
+            
+            if not connection['pageInfo']['hasNextPage']:
                 break
             
+            cursor = connection['pageInfo']['endCursor']
             page += 1
         
         print(f"✓ Found {len(issues)} issues to copy")
@@ -343,9 +534,21 @@ class RepoContentCopier:
             'labels': labels
         }
         
-        response = requests.post(url, headers=self.headers, json=new_issue)
+        response = self.session.post(url, json=new_issue)
+        
+        # Rate limits (429, or 403 for secondary limits) mean the issue was not
+        # created, so wait and retry a bounded number of times before reporting
+        attempts = 1
+        while (response.status_code in (403, 429) and 'Retry-After' in response.headers
+               and attempts < self.MAX_CREATE_ATTEMPTS):
+            self.wait_for_rate_limit(response)
+            response = self.session.post(url, json=new_issue)
+            attempts += 1
         
         if response.status_code == 201:
+            # Pace the following requests if the primary limit is running low
+            self.wait_for_rate_limit(response)
+            
             new_issue_data = response.json()
             print(f"  ✓ Created issue #{new_issue_data['number']}: {issue_data['title']}")
             
@@ -360,12 +563,29 @@ class RepoContentCopier:
             print(f"    Response: {response.text}")
             return False
     
+    def wait_for_rate_limit(self, response: requests.Response):
+        """Sleep if the response says the API rate limit is exhausted or nearly so."""
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            # Never retry immediately, even if told to wait 0 seconds
+            delay = max(int(retry_after), 1)
+        else:
+            remaining = response.headers.get('X-RateLimit-Remaining')
+            if remaining is None or int(remaining) >= self.RATE_LIMIT_THRESHOLD:
+                return
+            reset = int(response.headers.get('X-RateLimit-Reset', 0))
+            delay = max(reset - int(time.time()), 0)
+        
+        if delay > 0:
+            print(f"  ⚠ Rate limit reached, waiting {delay} seconds...")
+            time.sleep(delay)
+    
     def close_issue(self, issue_number: int):
         """Close an issue in the destination repository."""
         url = f"https://api.github.com/repos/{self.dest_repo}/issues/{issue_number}"
         data = {'state': 'closed'}
         
-        response = requests.patch(url, headers=self.headers, json=data)
+        response = self.session.patch(url, json=data)
         
         if response.status_code == 200:
             print(f"    ✓ Closed issue #{issue_number}")
@@ -393,11 +613,15 @@ class RepoContentCopier:
         success_count = 0
         failed_count = 0
         
-        for issue in issues:
-            if self.create_issue(issue):
-                success_count += 1
-            else:
-                failed_count += 1
+        # Issues are independent, so create them concurrently over the shared session
+        with ThreadPoolExecutor(max_workers=self.MAX_ISSUE_WORKERS) as executor:
+            futures = [executor.submit(self.create_issue, issue) for issue in issues]
+            
+            for future in as_completed(futures):
+                if future.result():
+                    success_count += 1
+                else:
+                    failed_count += 1
         
         print(f"\n✓ Successfully created {success_count} issues")
         if failed_count > 0:
@@ -426,6 +650,10 @@ class RepoContentCopier:
         # Check if destination repo is empty (unless force is specified)
         if not force:
             is_empty, unexpected_files = self.check_dest_repo_empty()
+            if not is_empty and not unexpected_files:
+                # The check itself failed (details printed above)
+                print("\n✗ Could not verify that the destination repository is empty.")
+                sys.exit(1)
             if not is_empty:
                 print("\n✗ Destination repository is not empty!")
                 print("  To copy anyway, use the --force flag.")
@@ -499,7 +727,9 @@ Note:
     
     # Validate repository format
     for repo_name, repo_value in [('source', args.source), ('dest', args.dest)]:
-        if '/' not in repo_value or len(repo_value.split('/')) != 2:
+        try:
+            parse_repo(repo_value)
+        except ValueError:
             parser.error(f"Invalid {repo_name} repository format: '{repo_value}'. Expected format: 'owner/repo'")
     
     # Get GitHub token from argument, environment, or GitHub CLI